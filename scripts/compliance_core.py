@@ -0,0 +1,389 @@
+"""
+Shared checklist assessment for the compliance report and security dashboard.
+
+Both scripts call assess_all() so a CI run walks the checklist and resolves
+artifacts the same way, from a single snapshot of the working tree.
+"""
+
+import csv
+import functools
+import glob
+import json
+import os
+import posixpath
+import re
+import sys
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from enum import IntEnum
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+class Status(IntEnum):
+    """Assessment status of a control; values index the per-layer count lists."""
+    IMPLEMENTED = 0
+    MISSING = 1
+    NOT_APPLICABLE = 2
+
+# Report label for each Status, indexed by its value
+STATUS_LABEL = ("Implemented", "Missing", "Not Applicable")
+
+# Checklist CSV columns read by the assessment, keyed by Control field name
+CHECKLIST_COLUMNS = {
+    "layer_number": "Layer #",
+    "layer_name": "Layer Name",
+    "control_group": "Control Group",
+    "control": "Control",
+    "artifact": "Policy/Config Artifact",
+    "component": "Component (Rust/K8s/Web3)",
+    "test_category": "Test Category",
+    "metric_kpi": "Metric/KPI",
+    "evidence": "Evidence to Store",
+}
+
+Control = namedtuple("Control", CHECKLIST_COLUMNS)
+
+def load_checklist(filename: str) -> Iterator[Control]:
+    """Stream the security layers checklist from CSV file, one Control per row."""
+    try:
+        with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, [])
+            width = len(header)
+            col = {name: i for i, name in enumerate(header)}
+            # Columns absent from the header point at a trailing blank cell
+            get_fields = itemgetter(*(col.get(name, width) for name in CHECKLIST_COLUMNS.values()))
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                row.append("")
+                yield Control._make(get_fields(row))
+    except FileNotFoundError:
+        print(f"Error: Checklist file '{filename}' not found.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error reading checklist: {e}")
+        sys.exit(1)
+
+# Directories pruned from the tree snapshot; artifacts below them are still
+# found through the filesystem fallback in check_artifact_exists()
+SNAPSHOT_SKIP_DIRS = frozenset({".git", "target", "node_modules"})
+
+# Directories existing_paths() recorded but did not descend into (pruned or
+# symlinked), as '/'-separated component tuples; refreshed on every walk
+_unwalked_dirs: List[Tuple[str, ...]] = []
+
+@functools.lru_cache(maxsize=None)
+def existing_paths() -> FrozenSet[str]:
+    """Snapshot every file and directory under the working directory in one walk.
+
+    Paths are relative and '/'-separated. Directories are recorded both bare
+    and with a trailing slash, so an artifact such as 'crates/http/' only
+    matches a directory. Symlinked directories and SNAPSHOT_SKIP_DIRS are
+    not descended into; they are listed in _unwalked_dirs instead.
+    """
+    existing = set()
+    unwalked = []
+    for dirpath, dirnames, filenames in os.walk(".", followlinks=False):
+        base = dirpath[2:].replace(os.sep, "/")
+        prefix = f"{base}/" if base else ""
+        for name in dirnames:
+            existing.add(prefix + name)
+            existing.add(f"{prefix}{name}/")
+            if name in SNAPSHOT_SKIP_DIRS or os.path.islink(os.path.join(dirpath, name)):
+                unwalked.append(tuple((prefix + name).split("/")))
+        existing.update(prefix + name for name in filenames)
+        dirnames[:] = [name for name in dirnames if name not in SNAPSHOT_SKIP_DIRS]
+    _unwalked_dirs[:] = unwalked
+    return frozenset(existing)
+
+# Wildcard artifact -> whether it matched the snapshot, filled by match_artifact_patterns()
+_pattern_matches: Dict[str, bool] = {}
+
+def is_outside_tree(artifact_path: str) -> bool:
+    """Return True if the artifact lies outside the tree snapshot's root."""
+    return os.path.isabs(artifact_path) or artifact_path.startswith("..")
+
+def snapshot_key(artifact_path: str) -> str:
+    """Normalize an artifact path to the snapshot's form, keeping a trailing slash."""
+    if os.sep != "/":
+        artifact_path = artifact_path.replace(os.sep, "/")
+    path = posixpath.normpath(artifact_path)
+    if artifact_path.endswith("/"):
+        path += "/"
+    return path
+
+def _translate_segment(segment: str) -> str:
+    """Translate one wildcard path segment to a regex that never crosses '/'."""
+    i, n = 0, len(segment)
+    parts = []
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == '*':
+            if not parts or parts[-1] != "[^/]*":
+                parts.append("[^/]*")
+        elif c == '?':
+            parts.append("[^/]")
+        elif c == '[':
+            j = i
+            if j < n and segment[j] == '!':
+                j += 1
+            if j < n and segment[j] == ']':
+                j += 1
+            while j < n and segment[j] != ']':
+                j += 1
+            if j >= n:
+                parts.append("\\[")
+            else:
+                stuff = segment[i:j].replace("\\", "\\\\")
+                i = j + 1
+                if stuff[0] == '!':
+                    stuff = "^" + stuff[1:]
+                elif stuff[0] in "^[":
+                    stuff = "\\" + stuff
+                parts.append(f"(?!/)[{stuff}]")
+        else:
+            parts.append(re.escape(c))
+    return "".join(parts)
+
+def translate_glob(pattern: str) -> str:
+    """Translate a wildcard artifact to a regex with glob.glob(recursive=True) semantics.
+
+    '*', '?' and '[...]' stay within one path segment, '**' spans zero or more
+    directories, wildcard segments skip dot-names unless the pattern segment
+    starts with '.', and the snapshot's trailing-slash directory entries only
+    match patterns that end in '/'.
+    """
+    segments = pattern.split("/")
+    last = len(segments) - 1
+    parts = []
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            # Like glob, '**' does not descend into hidden directories
+            parts.append(r"(?:(?!\.)[^/]+/)*")
+            if i == last:
+                parts.append(r"(?:(?!\.)[^/]+)?")
+            continue
+        if glob.has_magic(segment):
+            if not segment.startswith("."):
+                parts.append(r"(?!\.)")
+            parts.append(_translate_segment(segment))
+        else:
+            parts.append(re.escape(segment))
+        if i != last:
+            parts.append("/")
+    if segments[-1] not in ("", "**"):
+        parts.append("(?<!/)")
+    return "(?s:" + "".join(parts) + r")\Z"
+
+# glob matches case-insensitively on Windows
+PATTERN_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+@functools.lru_cache(maxsize=512)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a wildcard artifact pattern to a regex, once per pattern."""
+    return re.compile(translate_glob(pattern), PATTERN_FLAGS)
+
+def _may_reach(segments: List[str], parts: Tuple[str, ...]) -> bool:
+    """Return True if a path matching the pattern segments could lie below parts."""
+    if not parts:
+        # Only a match strictly below the directory is invisible to the snapshot
+        return bool(segments) and segments != [""]
+    if not segments:
+        return False
+    segment = segments[0]
+    if segment == "**":
+        return _may_reach(segments[1:], parts) or (
+            not parts[0].startswith(".") and _may_reach(segments, parts[1:])
+        )
+    return bool(compile_pattern(segment).match(parts[0])) and _may_reach(segments[1:], parts[1:])
+
+def is_unwalked(path: str) -> bool:
+    """Return True if the snapshot cannot rule out an artifact at this snapshot_key().
+
+    That is the case when the artifact could resolve to something below a
+    directory existing_paths() did not descend into.
+    """
+    existing_paths()
+    if not _unwalked_dirs:
+        return False
+    segments = path.split("/")
+    return any(_may_reach(segments, parts) for parts in _unwalked_dirs)
+
+def match_artifact_patterns(artifacts: Iterable[str]) -> None:
+    """Resolve all wildcard artifacts against the snapshot in a single pass.
+
+    The patterns are compiled with glob semantics into one regex union;
+    only snapshot paths that match the union are tested against the
+    patterns still unresolved. A pattern left unmatched is final unless
+    is_unwalked() says it could match below a directory the snapshot skipped.
+    """
+    pending = {}
+    for artifact in artifacts:
+        if ('*' in artifact or '?' in artifact) and not is_outside_tree(artifact) \
+                and artifact not in _pattern_matches:
+            pending[artifact] = compile_pattern(snapshot_key(artifact))
+            _pattern_matches[artifact] = False
+    if not pending:
+        return
+    
+    union = re.compile(
+        "|".join(f"(?:{regex.pattern})" for regex in pending.values()),
+        PATTERN_FLAGS
+    )
+    for path in existing_paths():
+        if not union.match(path):
+            continue
+        for artifact, regex in list(pending.items()):
+            if regex.match(path):
+                _pattern_matches[artifact] = True
+                del pending[artifact]
+        if not pending:
+            break
+
+@functools.lru_cache(maxsize=None)
+def check_artifact_exists(artifact_path: str) -> bool:
+    """Check if an artifact (file or directory) exists.
+
+    Artifacts inside the working directory are resolved against the
+    existing_paths() snapshot, using the precomputed result for wildcard
+    artifacts seen by match_artifact_patterns(). Only artifacts outside the
+    tree, or that could lie below a pruned or symlinked directory, are
+    checked on the filesystem instead. Results are memoized per artifact
+    string for the duration of the run.
+    """
+    if not artifact_path:
+        return False
+    
+    is_pattern = '*' in artifact_path or '?' in artifact_path
+    
+    if not is_outside_tree(artifact_path):
+        path = snapshot_key(artifact_path)
+        
+        # Handle wildcard patterns
+        if is_pattern:
+            if artifact_path not in _pattern_matches:
+                regex = compile_pattern(path)
+                _pattern_matches[artifact_path] = any(
+                    regex.match(existing) for existing in existing_paths()
+                )
+            found = _pattern_matches[artifact_path]
+        
+        # Check exact path
+        else:
+            found = path in existing_paths()
+        
+        if found or not is_unwalked(path):
+            return found
+    
+    # Fall back to the filesystem for anything the snapshot cannot see
+    if is_pattern:
+        return len(glob.glob(artifact_path, recursive=True)) > 0
+    return os.path.exists(artifact_path)
+
+def assess_control(control: Control) -> Dict[str, Any]:
+    """Assess a single control and return assessment results."""
+    artifact = control.artifact
+    
+    # Determine status
+    if not artifact:
+        status = Status.NOT_APPLICABLE
+        reason = "No artifact specified"
+    elif check_artifact_exists(artifact):
+        status = Status.IMPLEMENTED
+        reason = "Artifact found"
+    else:
+        status = Status.MISSING
+        reason = "Artifact not found"
+    
+    return {
+        "layer_number": control.layer_number,
+        "layer_name": control.layer_name,
+        "control_group": control.control_group,
+        "control": control.control,
+        "status": status,
+        "reason": reason,
+        "artifact": artifact,
+        "component": control.component,
+        "test_category": control.test_category,
+        "metric_kpi": control.metric_kpi,
+        "evidence": control.evidence
+    }
+
+def generate_summary(assessments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate summary statistics from assessments in a single pass.
+
+    Rows are only tallied into the per-layer status table; the overall
+    totals are column sums over that much smaller table.
+    """
+    layer_counts = defaultdict(lambda: [0, 0, 0])
+    for assessment in assessments:
+        layer_counts[assessment["layer_number"]][assessment["status"]] += 1
+    
+    total = len(assessments)
+    implemented, missing, not_applicable = (
+        [sum(column) for column in zip(*layer_counts.values())] or [0, 0, 0]
+    )
+    
+    # Calculate compliance rate
+    applicable = implemented + missing
+    compliance_rate = (implemented / applicable * 100) if applicable > 0 else 0
+    
+    # Group by layer
+    layer_stats = {
+        layer_num: {"implemented": counts[0], "missing": counts[1], "not_applicable": counts[2]}
+        for layer_num, counts in layer_counts.items()
+    }
+    
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "total_controls": total,
+        "implemented": implemented,
+        "missing": missing,
+        "not_applicable": not_applicable,
+        "applicable": applicable,
+        "compliance_rate": compliance_rate,
+        "layer_statistics": layer_stats
+    }
+
+def assess_all(checklist_file: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Assess every control in the checklist and summarize the results."""
+    # Parse the checklist once, resolve its wildcard artifacts in one
+    # pass, then assess each control
+    controls = list(load_checklist(checklist_file))
+    match_artifact_patterns(control.artifact for control in controls)
+    assessments = [assess_control(control) for control in controls]
+    return assessments, generate_summary(assessments)
+
+def dumps_json(data: Any) -> bytes:
+    """Serialize data as 2-space indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write data to path atomically.
+
+    The bytes go to a temporary sibling file in one buffered write, are
+    fsync'd, and then os.replace() swaps it into place, so readers never
+    see a partially written report.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=1 << 20) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
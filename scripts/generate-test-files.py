@@ -6,7 +6,9 @@ to ensure we have a complete implementation framework.
 """
 
 import os
+import string
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Define the testing categories and their test files
 TEST_CATEGORIES = {
@@ -206,47 +208,68 @@ mod tests {{
 }}
 """
 
+def split_template(template):
+    """Split a format template into (literal_text, field_name) fragments"""
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(template):
+        # render_test_template only substitutes plain {name} placeholders
+        if field is not None and not field.isidentifier():
+            raise ValueError(
+                f"Unsupported placeholder '{{{field}}}' in test template; use a named field"
+            )
+        if format_spec or conversion:
+            raise ValueError(
+                f"Unsupported format spec or conversion for field '{field}' in test template"
+            )
+        parts.append((literal, field))
+    return parts
+
+# TEST_TEMPLATE pre-split once into (literal_text, field_name) fragments
+TEST_TEMPLATE_PARTS = split_template(TEST_TEMPLATE)
+
+def render_test_template(**fields):
+    """Render TEST_TEMPLATE by joining its pre-split fragments"""
+    return "".join([
+        literal if field is None else literal + fields[field]
+        for literal, field in TEST_TEMPLATE_PARTS
+    ])
+
 def create_test_directory():
     """Create the tests directory if it doesn't exist"""
     test_dir = "tests"
-    if not os.path.exists(test_dir):
-        os.makedirs(test_dir)
+    os.makedirs(test_dir, exist_ok=True)
     return test_dir
 
-def create_test_file(category, test_name):
-    """Create a test file for a specific category and test type"""
-    # Convert category to snake_case if it isn't already
-    category_file = category.lower().replace("-", "_").replace(" ", "_")
-    
-    # Create category directory if it doesn't exist
-    category_dir = f"tests/{category_file}"
-    if not os.path.exists(category_dir):
-        os.makedirs(category_dir)
-    
-    # Create the test file
-    file_path = f"{category_dir}/mod.rs"
+def category_module_name(category):
+    """Convert a category to its snake_case module name"""
+    return category.lower().replace("-", "_").replace(" ", "_")
+
+def create_category_mod(category):
+    """Write a category's mod.rs declaring all of its test modules"""
+    category_dir = f"tests/{category_module_name(category)}"
+    os.makedirs(category_dir, exist_ok=True)
     
-    # If file already exists, append to it
-    if os.path.exists(file_path):
-        with open(file_path, "a") as f:
-            f.write(f"\nmod {test_name};\n")
-    else:
-        # Create new file with module declarations
-        with open(file_path, "w") as f:
-            f.write(f"//! {category.replace('_', ' ').title()} Tests\n\n")
-            for test in TEST_CATEGORIES[category]:
-                f.write(f"mod {test};\n")
+    content = f"//! {category.replace('_', ' ').title()} Tests\n\n" + "".join(
+        f"mod {test};\n" for test in TEST_CATEGORIES[category]
+    )
+    with open(f"{category_dir}/mod.rs", "w") as f:
+        f.write(content)
+
+def create_test_stub(category, test_name):
+    """Create the test file for a specific category and test type"""
+    test_file_path = f"tests/{category_module_name(category)}/{test_name}.rs"
     
-    # Create individual test files
-    test_file_path = f"{category_dir}/{test_name}.rs"
-    if not os.path.exists(test_file_path):
-        with open(test_file_path, "w") as f:
-            content = TEST_TEMPLATE.format(
+    # Leave existing test files untouched
+    try:
+        with open(test_file_path, "x") as f:
+            content = render_test_template(
                 category_title=category.replace('_', ' ').title(),
                 category_description=f"{category.replace('_', ' ')} testing category",
                 test_name=test_name
             )
             f.write(content)
+    except FileExistsError:
+        pass
 
 def create_main_test_file():
     """Create the main test file that includes all categories"""
@@ -257,8 +280,7 @@ def create_main_test_file():
 """
     
     for category in TEST_CATEGORIES:
-        category_module = category.lower().replace("-", "_").replace(" ", "_")
-        content += f"mod {category_module};\n"
+        content += f"mod {category_module_name(category)};\n"
     
     with open("tests/mod.rs", "w") as f:
         f.write(content)
@@ -270,11 +292,16 @@ def main():
     # Create test directory
     create_test_directory()
     
-    # Generate test files for each category
-    for category, tests in TEST_CATEGORIES.items():
+    # Report progress here, in order, rather than from the worker threads
+    for category in TEST_CATEGORIES:
         print(f"Creating tests for {category}...")
-        for test in tests:
-            create_test_file(category, test)
+    
+    # Write each category's mod.rs once, then the individual test files;
+    # the mod.rs pass also creates the directories the stubs are written to
+    tasks = [(category, test) for category, tests in TEST_CATEGORIES.items() for test in tests]
+    with ThreadPoolExecutor(max_workers=min(32, len(tasks))) as executor:
+        list(executor.map(create_category_mod, TEST_CATEGORIES))
+        list(executor.map(lambda task: create_test_stub(*task), tasks))
     
     # Create main test file
     create_main_test_file()
@@ -6,37 +6,167 @@ This script generates a security dashboard with metrics and KPIs
 based on the security layers checklist.
 """
 
-import csv
+import io
 import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, Optional, Tuple, Any
+
+from compliance_core import assess_all, check_artifact_exists, dumps_json, write_atomic
+
+try:
+    import ijson
+except ImportError:  # optional; fall back to parsing the whole document
+    ijson = None
+
+# Security layer names keyed by layer number
+LAYER_NAMES: Dict[str, str] = {
+    "1": "Governance & Policy",
+    "2": "Risk & Threat Modeling",
+    "3": "Secure SDLC & Supply Chain",
+    "4": "Identity & Access (IAM)",
+    "5": "Secrets Management",
+    "6": "Key & Cryptography",
+    "7": "Network Segmentation & Transport",
+    "8": "Perimeter & API Gateway",
+    "9": "Host/Endpoint Hardening",
+    "10": "Containers & Orchestration",
+    "11": "Cloud/IaaS Security",
+    "12": "Data Security",
+    "13": "Application Security",
+    "14": "Protocol/API Security",
+    "15": "Messaging & Event Security",
+    "16": "Database Security",
+    "17": "Wallet/Custody & Key Ops (Web3)",
+    "18": "Oracle & Market Data Integrity (Web3)",
+    "19": "Privacy & Compliance",
+    "20": "Observability & Telemetry Security",
+    "21": "Detection & Response",
+    "22": "Resilience, Availability & Chaos"
+}
+
+# JSON report written by generate-compliance-report.py; in CI the dashboard
+# job downloads it from the compliance_check job
+COMPLIANCE_REPORT_FILE = "security-compliance-report.json"
+
+# CVSS v3.x base metric weights; PR_CHANGED overrides PR when scope is changed
+CVSS3_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "AV": {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2},
+    "AC": {"L": 0.77, "H": 0.44},
+    "PR": {"N": 0.85, "L": 0.62, "H": 0.27},
+    "PR_CHANGED": {"N": 0.85, "L": 0.68, "H": 0.5},
+    "UI": {"N": 0.85, "R": 0.62},
+    "CIA": {"H": 0.56, "L": 0.22, "N": 0.0},
+}
+
+# Lowest CVSS base score rated critical
+CRITICAL_CVSS_SCORE = 9.0
+
+def _cvss_roundup(value: float) -> float:
+    """Round up to one decimal place as specified by CVSS v3.1."""
+    scaled = round(value * 100000)
+    if scaled % 10000 == 0:
+        return scaled / 100000.0
+    return (scaled // 10000 + 1) / 10.0
+
+def cvss_base_score(vector: str) -> float:
+    """Compute the base score of a CVSS v3.x vector such as 'CVSS:3.1/AV:N/...'.
+
+    Raises ValueError for other CVSS versions or incomplete vectors.
+    """
+    version, _, rest = vector.partition("/")
+    if version not in ("CVSS:3.0", "CVSS:3.1"):
+        raise ValueError(f"unsupported CVSS vector: {vector}")
+    metrics = dict(part.split(":", 1) for part in rest.split("/") if ":" in part)
+    try:
+        changed = metrics["S"] == "C"
+        pr_weights = CVSS3_WEIGHTS["PR_CHANGED" if changed else "PR"]
+        exploitability = 8.22 * (
+            CVSS3_WEIGHTS["AV"][metrics["AV"]] * CVSS3_WEIGHTS["AC"][metrics["AC"]]
+            * pr_weights[metrics["PR"]] * CVSS3_WEIGHTS["UI"][metrics["UI"]]
+        )
+        iss = 1 - (
+            (1 - CVSS3_WEIGHTS["CIA"][metrics["C"]])
+            * (1 - CVSS3_WEIGHTS["CIA"][metrics["I"]])
+            * (1 - CVSS3_WEIGHTS["CIA"][metrics["A"]])
+        )
+    except KeyError as e:
+        raise ValueError(f"incomplete CVSS vector: {vector}") from e
+    
+    if changed:
+        impact = 7.52 * (iss - 0.029) - 3.25 * (iss - 0.02) ** 15
+    else:
+        impact = 6.42 * iss
+    if impact <= 0:
+        return 0.0
+    if changed:
+        return _cvss_roundup(min(1.08 * (impact + exploitability), 10))
+    return _cvss_roundup(min(impact + exploitability, 10))
+
+def is_critical_cvss(vector: Any) -> bool:
+    """Return True if an advisory's cvss vector rates as critical.
+
+    Advisories without a CVSS v3.x vector are not counted as critical.
+    """
+    if not isinstance(vector, str):
+        return False
+    try:
+        return cvss_base_score(vector) >= CRITICAL_CVSS_SCORE
+    except ValueError:
+        return False
+
+def count_vulnerabilities(audit_output: bytes) -> Tuple[int, int]:
+    """Count (total, critical) advisories in cargo audit JSON.
+
+    cargo audit reports ``{"vulnerabilities": {"found", "count", "list": [...]}}``.
+    RustSec advisories carry no severity, so an entry is critical when the
+    base score of its ``advisory.cvss`` vector is at least CRITICAL_CVSS_SCORE.
+    With ijson installed the output is streamed rather than loaded whole.
+    Raises ValueError if the output is not JSON of that shape, so a parse
+    problem is never reported as zero vulnerabilities.
+    """
+    count = critical = 0
+    if ijson is not None:
+        found_list = False
+        try:
+            for prefix, event, value in ijson.parse(io.BytesIO(audit_output)):
+                if prefix == "vulnerabilities.list" and event == "start_array":
+                    found_list = True
+                elif prefix == "vulnerabilities.list.item" and event == "start_map":
+                    count += 1
+                elif prefix == "vulnerabilities.list.item.advisory.cvss" and is_critical_cvss(value):
+                    critical += 1
+        except ijson.JSONError as e:
+            raise ValueError(f"invalid cargo audit JSON: {e}") from e
+        if not found_list:
+            raise ValueError("cargo audit JSON has no vulnerabilities.list array")
+        return count, critical
+    
+    audit_data = json.loads(audit_output)
+    vulnerabilities = audit_data.get("vulnerabilities") if isinstance(audit_data, dict) else None
+    entries = vulnerabilities.get("list") if isinstance(vulnerabilities, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError("cargo audit JSON has no vulnerabilities.list array")
+    for entry in entries:
+        count += 1
+        advisory = entry.get("advisory") if isinstance(entry, dict) else None
+        if isinstance(advisory, dict) and is_critical_cvss(advisory.get("cvss")):
+            critical += 1
+    return count, critical
 
 class SecurityDashboard:
     def __init__(self, checklist_file: str = "security_layers_checklist.csv"):
         self.checklist_file = checklist_file
-        self.checklist = self.load_checklist()
         self.metrics = {}
         
-    def load_checklist(self) -> List[Dict[str, Any]]:
-        """Load the security layers checklist from CSV file."""
-        checklist = []
-        try:
-            with open(self.checklist_file, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    checklist.append(row)
-        except FileNotFoundError:
-            print(f"Error: Checklist file '{self.checklist_file}' not found.")
-            sys.exit(1)
-        except Exception as e:
-            print(f"Error reading checklist: {e}")
+        # Fail fast before spending time on the audit tools
+        if not os.path.isfile(checklist_file):
+            print(f"Error: Checklist file '{checklist_file}' not found.")
             sys.exit(1)
         
-        return checklist
-    
     def run_security_audit(self) -> Dict[str, Any]:
         """Run security audit tools and collect metrics."""
         metrics = {
@@ -47,98 +177,105 @@ class SecurityDashboard:
             "secrets": {}
         }
         
-        # Run cargo audit if available
-        try:
-            result = subprocess.run(
+        # Run cargo audit and cargo deny concurrently; they are independent
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Keep audit output as bytes so it can be parsed incrementally
+            audit_future = executor.submit(
+                subprocess.run,
                 ["cargo", "audit", "--json"],
                 capture_output=True,
-                text=True,
                 timeout=60
             )
-            if result.returncode == 0:
-                audit_data = json.loads(result.stdout)
-                metrics["vulnerabilities"]["count"] = len(audit_data.get("vulnerabilities", []))
-                metrics["vulnerabilities"]["critical"] = len([
-                    v for v in audit_data.get("vulnerabilities", [])
-                    if v.get("severity") == "critical"
-                ])
-            else:
-                metrics["vulnerabilities"]["error"] = "Cargo audit failed"
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-            metrics["vulnerabilities"]["error"] = "Cargo audit not available"
-        
-        # Run cargo deny checks
-        try:
-            result = subprocess.run(
+            deny_future = executor.submit(
+                subprocess.run,
                 ["cargo", "deny", "check", "--format", "json"],
                 capture_output=True,
                 text=True,
                 timeout=60
             )
-            if result.returncode == 0:
-                deny_data = json.loads(result.stdout)
-                metrics["compliance"]["license_issues"] = len(deny_data.get("licenses", []))
-                metrics["compliance"]["ban_issues"] = len(deny_data.get("bans", []))
-            else:
-                metrics["compliance"]["error"] = "Cargo deny failed"
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
-            metrics["compliance"]["error"] = "Cargo deny not available"
+            
+            # Collect cargo audit results if available; it exits non-zero
+            # when it finds vulnerabilities, so parse any JSON it printed
+            try:
+                result = audit_future.result()
+                count, critical = count_vulnerabilities(result.stdout)
+                metrics["vulnerabilities"]["count"] = count
+                metrics["vulnerabilities"]["critical"] = critical
+            except ValueError:
+                if result.returncode == 0:
+                    metrics["vulnerabilities"]["error"] = "Unexpected cargo audit output"
+                else:
+                    metrics["vulnerabilities"]["error"] = "Cargo audit failed"
+            except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
+                metrics["vulnerabilities"]["error"] = "Cargo audit not available"
+            
+            # Collect cargo deny results
+            try:
+                result = deny_future.result()
+                if result.returncode == 0:
+                    deny_data = json.loads(result.stdout)
+                    metrics["compliance"]["license_issues"] = len(deny_data.get("licenses", []))
+                    metrics["compliance"]["ban_issues"] = len(deny_data.get("bans", []))
+                else:
+                    metrics["compliance"]["error"] = "Cargo deny failed"
+            except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
+                metrics["compliance"]["error"] = "Cargo deny not available"
         
         return metrics
     
-    def calculate_compliance_metrics(self) -> Dict[str, Any]:
-        """Calculate compliance metrics from the checklist."""
-        total_controls = len(self.checklist)
-        implemented_controls = 0
-        missing_controls = 0
+    def load_compliance_summary(self) -> Optional[Dict[str, Any]]:
+        """Load the summary from an existing compliance JSON report, if any."""
+        try:
+            with open(COMPLIANCE_REPORT_FILE, "rb") as f:
+                report = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable {COMPLIANCE_REPORT_FILE}: {e}")
+            return None
         
-        # Count implemented vs missing controls
-        for control in self.checklist:
-            artifact = control.get("Policy/Config Artifact", "")
-            if artifact and self.check_artifact_exists(artifact):
-                implemented_controls += 1
-            elif artifact:
-                missing_controls += 1
+        summary = report.get("summary") if isinstance(report, dict) else None
+        if not isinstance(summary, dict) or "layer_statistics" not in summary:
+            print(f"Warning: ignoring {COMPLIANCE_REPORT_FILE} without a summary")
+            return None
+        return summary
+    
+    def calculate_compliance_metrics(self) -> Dict[str, Any]:
+        """Calculate compliance metrics from the checklist assessment.
+
+        The summary already written by generate-compliance-report.py is
+        reused when present, so a CI run assesses the checklist only once;
+        otherwise the checklist is assessed here.
+        """
+        summary = self.load_compliance_summary()
+        if summary is None:
+            _, summary = assess_all(self.checklist_file)
         
-        # Calculate by layer
         layer_metrics = {}
-        for control in self.checklist:
-            layer_num = control.get("Layer #", "Unknown")
-            if layer_num not in layer_metrics:
-                layer_metrics[layer_num] = {"total": 0, "implemented": 0, "missing": 0}
-            
-            layer_metrics[layer_num]["total"] += 1
-            artifact = control.get("Policy/Config Artifact", "")
-            if artifact and self.check_artifact_exists(artifact):
-                layer_metrics[layer_num]["implemented"] += 1
-            elif artifact:
-                layer_metrics[layer_num]["missing"] += 1
+        for layer_num, stats in summary["layer_statistics"].items():
+            layer_metrics[layer_num or "Unknown"] = {
+                "total": stats["implemented"] + stats["missing"] + stats["not_applicable"],
+                "implemented": stats["implemented"],
+                "missing": stats["missing"]
+            }
         
+        total_controls = summary["total_controls"]
+        implemented_controls = summary["implemented"]
         return {
             "total_controls": total_controls,
             "implemented_controls": implemented_controls,
-            "missing_controls": missing_controls,
+            "missing_controls": summary["missing"],
             "compliance_rate": (implemented_controls / total_controls * 100) if total_controls > 0 else 0,
             "layer_metrics": layer_metrics
         }
     
     def check_artifact_exists(self, artifact_path: str) -> bool:
         """Check if an artifact (file or directory) exists."""
-        if not artifact_path:
-            return False
-        
-        # Handle wildcard patterns
-        if '*' in artifact_path or '?' in artifact_path:
-            import glob
-            matches = glob.glob(artifact_path, recursive=True)
-            return len(matches) > 0
-        
-        # Check exact path
-        return os.path.exists(artifact_path)
+        return check_artifact_exists(artifact_path)
     
     def generate_html_report(self, audit_metrics: Dict[str, Any], compliance_metrics: Dict[str, Any]) -> str:
         """Generate an HTML dashboard report."""
-        html = f"""
+        parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -197,14 +334,14 @@ class SecurityDashboard:
                 </tr>
             </thead>
             <tbody>
-"""
+"""]
         
         # Add layer metrics
         for layer_num, metrics in compliance_metrics["layer_metrics"].items():
             rate = (metrics["implemented"] / metrics["total"] * 100) if metrics["total"] > 0 else 0
             status_class = "compliant" if rate >= 90 else "warning" if rate >= 70 else "non-compliant"
             
-            html += f"""
+            parts.append(f"""
                 <tr>
                     <td>{layer_num}</td>
                     <td>{self.get_layer_name(layer_num)}</td>
@@ -212,9 +349,9 @@ class SecurityDashboard:
                     <td>{metrics['implemented']}</td>
                     <td>{metrics['total']}</td>
                 </tr>
-"""
+""")
         
-        html += """
+        parts.append(f"""
             </tbody>
         </table>
     </div>
@@ -231,36 +368,12 @@ class SecurityDashboard:
     </div>
 </body>
 </html>
-"""
-        return html
+""")
+        return "".join(parts)
     
     def get_layer_name(self, layer_num: str) -> str:
         """Get the name of a security layer by its number."""
-        layer_names = {
-            "1": "Governance & Policy",
-            "2": "Risk & Threat Modeling",
-            "3": "Secure SDLC & Supply Chain",
-            "4": "Identity & Access (IAM)",
-            "5": "Secrets Management",
-            "6": "Key & Cryptography",
-            "7": "Network Segmentation & Transport",
-            "8": "Perimeter & API Gateway",
-            "9": "Host/Endpoint Hardening",
-            "10": "Containers & Orchestration",
-            "11": "Cloud/IaaS Security",
-            "12": "Data Security",
-            "13": "Application Security",
-            "14": "Protocol/API Security",
-            "15": "Messaging & Event Security",
-            "16": "Database Security",
-            "17": "Wallet/Custody & Key Ops (Web3)",
-            "18": "Oracle & Market Data Integrity (Web3)",
-            "19": "Privacy & Compliance",
-            "20": "Observability & Telemetry Security",
-            "21": "Detection & Response",
-            "22": "Resilience, Availability & Chaos"
-        }
-        return layer_names.get(layer_num, "Unknown Layer")
+        return LAYER_NAMES.get(layer_num, "Unknown Layer")
     
     def generate_dashboard(self):
         """Generate the complete security dashboard."""
@@ -276,8 +389,7 @@ class SecurityDashboard:
         html_report = self.generate_html_report(audit_metrics, compliance_metrics)
         
         # Save reports
-        with open("security-dashboard.html", "w", encoding="utf-8") as f:
-            f.write(html_report)
+        write_atomic("security-dashboard.html", html_report.encode("utf-8"))
         
         # Save metrics as JSON
         dashboard_data = {
@@ -286,8 +398,7 @@ class SecurityDashboard:
             "compliance_metrics": compliance_metrics
         }
         
-        with open("security-dashboard.json", "w", encoding="utf-8") as f:
-            json.dump(dashboard_data, f, indent=2)
+        write_atomic("security-dashboard.json", dumps_json(dashboard_data))
         
         print("Security dashboard generated successfully!")
         print("- security-dashboard.html")
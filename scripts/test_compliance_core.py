@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Regression tests for artifact resolution in compliance_core.
+
+Wildcard artifacts must resolve exactly as glob.glob(..., recursive=True)
+would, even though they are matched against the tree snapshot.
+"""
+
+import glob
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import compliance_core
+
+TREE_FILES = [
+    "docs/runbooks/.gitkeep",
+    "docs/security/POLICY.md",
+    "packages/a/src/lib.rs",
+    "src/main.rs",
+    "src/sub/mod.rs",
+    ".hidden/a.rs",
+    "jobs/rotate-a.yaml",
+    "jobs/.rotate-b.yaml",
+    "target/debug/report.json",
+    "web/node_modules/pkg/index.js",
+    "real/inner.txt",
+]
+
+TREE_DIRS = ["empty"]
+
+PATTERNS = [
+    "docs/runbooks/*",
+    "docs/runbooks/.*",
+    "docs/*/",
+    "docs/*/*.md",
+    "packages/*.rs",
+    "packages/*/src/*.rs",
+    "src/**/*.rs",
+    "src/**/main.rs",
+    "src/**",
+    "**/*.rs",
+    "**/a.rs",
+    "*/a.rs",
+    ".hidden/*",
+    "empty/*",
+    "empty/**",
+    "jobs/rotate-*.yaml",
+    "jobs/rotate-?.yaml",
+    "jobs/rotate-[ab].yaml",
+    "jobs/rotate-[!a].yaml",
+    "jobs/*-b.yaml",
+    "missing/*",
+]
+
+
+class ArtifactPatternTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        for path in TREE_FILES:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("")
+        for path in TREE_DIRS:
+            os.makedirs(path, exist_ok=True)
+        self.reset_caches()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+        self.reset_caches()
+
+    @staticmethod
+    def reset_caches():
+        compliance_core.existing_paths.cache_clear()
+        compliance_core.check_artifact_exists.cache_clear()
+        compliance_core._pattern_matches.clear()
+
+    def test_artifacts_outside_snapshot_fall_back_to_filesystem(self):
+        artifacts = [
+            "target/debug/report.json",
+            "web/node_modules/pkg/index.js",
+            "web/node_modules/*/index.js",
+            "target/**/*.json",
+        ]
+        try:
+            os.symlink("real", "linked", target_is_directory=True)
+            artifacts += ["linked/inner.txt", "linked/*.txt"]
+        except (OSError, NotImplementedError):
+            pass
+        compliance_core.match_artifact_patterns(artifacts)
+        for artifact in artifacts:
+            with self.subTest(artifact=artifact):
+                self.assertTrue(compliance_core.check_artifact_exists(artifact))
+        self.assertFalse(compliance_core.check_artifact_exists("target/missing.json"))
+
+    def test_snapshot_misses_skip_the_filesystem(self):
+        compliance_core.existing_paths()
+        with mock.patch.object(compliance_core.os.path, "exists") as exists:
+            self.assertFalse(compliance_core.check_artifact_exists("docs/missing.md"))
+            self.assertFalse(compliance_core.check_artifact_exists("src/main.rs/"))
+            self.assertTrue(compliance_core.check_artifact_exists("src/main.rs"))
+        exists.assert_not_called()
+
+    def test_pattern_union_misses_skip_glob(self):
+        patterns = ["missing/*", "docs/*/*.rs", "src/**/*.md"]
+        compliance_core.match_artifact_patterns(patterns)
+        with mock.patch.object(compliance_core.glob, "glob") as glob_glob:
+            for pattern in patterns:
+                with self.subTest(pattern=pattern):
+                    self.assertFalse(compliance_core.check_artifact_exists(pattern))
+        glob_glob.assert_not_called()
+
+    def test_snapshot_matches_glob(self):
+        paths = compliance_core.existing_paths()
+        for pattern in PATTERNS:
+            with self.subTest(pattern=pattern):
+                regex = compliance_core.compile_pattern(compliance_core.snapshot_key(pattern))
+                matched = any(regex.match(path) for path in paths)
+                self.assertEqual(matched, bool(glob.glob(pattern, recursive=True)))
+
+    def test_pattern_union_matches_glob(self):
+        # Only '*' and '?' mark an artifact as a wildcard
+        patterns = [p for p in PATTERNS if '*' in p or '?' in p]
+        compliance_core.match_artifact_patterns(patterns)
+        for pattern in patterns:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(
+                    compliance_core._pattern_matches[pattern],
+                    bool(glob.glob(pattern, recursive=True))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
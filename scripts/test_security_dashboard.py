@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for cargo audit output parsing in security-dashboard.py.
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+_spec = importlib.util.spec_from_file_location(
+    "security_dashboard",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "security-dashboard.py")
+)
+security_dashboard = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(security_dashboard)
+
+def _entry(advisory_id, package, cvss):
+    """A vulnerabilities.list entry in the shape cargo audit --json prints."""
+    return {
+        "advisory": {
+            "id": advisory_id,
+            "package": package,
+            "title": "Placeholder advisory",
+            "date": "2024-01-01",
+            "aliases": [],
+            "categories": [],
+            "keywords": [],
+            "cvss": cvss,
+            "informational": None,
+            "url": None,
+            "withdrawn": None,
+        },
+        "versions": {"patched": [">=1.0.1"], "unaffected": []},
+        "affected": None,
+        "package": {"name": package, "version": "1.0.0"},
+    }
+
+
+AUDIT_OUTPUT = json.dumps({
+    "database": {"advisory-count": 3},
+    "vulnerabilities": {
+        "found": True,
+        "count": 3,
+        "list": [
+            _entry("RUSTSEC-0000-0001", "a", "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H"),
+            _entry("RUSTSEC-0000-0002", "b", "CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:H/I:N/A:N"),
+            _entry("RUSTSEC-0000-0003", "c", None),
+        ]
+    }
+}).encode("utf-8")
+
+
+class CountVulnerabilitiesTest(unittest.TestCase):
+    def test_counts_cargo_audit_list(self):
+        self.assertEqual(security_dashboard.count_vulnerabilities(AUDIT_OUTPUT), (3, 1))
+
+    def test_counts_clean_report(self):
+        output = b'{"vulnerabilities": {"found": false, "count": 0, "list": []}}'
+        self.assertEqual(security_dashboard.count_vulnerabilities(output), (0, 0))
+
+    def test_rejects_unexpected_shape(self):
+        for output in (b'{"vulnerabilities": [{"severity": "critical"}]}', b'{}', b'not json'):
+            with self.subTest(output=output):
+                with self.assertRaises(ValueError):
+                    security_dashboard.count_vulnerabilities(output)
+
+
+class RunSecurityAuditTest(unittest.TestCase):
+    def run_audit(self, returncode, stdout):
+        def fake_run(args, **kwargs):
+            if args[1] == "audit":
+                return subprocess.CompletedProcess(args, returncode, stdout, b"")
+            return subprocess.CompletedProcess(args, 1, "", "")
+        dashboard = security_dashboard.SecurityDashboard.__new__(security_dashboard.SecurityDashboard)
+        with mock.patch.object(security_dashboard.subprocess, "run", fake_run):
+            return dashboard.run_security_audit()["vulnerabilities"]
+
+    def test_counts_report_when_audit_exits_nonzero(self):
+        self.assertEqual(self.run_audit(1, AUDIT_OUTPUT), {"count": 3, "critical": 1})
+
+    def test_reports_failure_without_json(self):
+        self.assertEqual(self.run_audit(1, b"error: failed to load Cargo.lock\n"),
+                         {"error": "Cargo audit failed"})
+
+
+class ComplianceMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.dashboard = security_dashboard.SecurityDashboard.__new__(security_dashboard.SecurityDashboard)
+        self.dashboard.checklist_file = "security_layers_checklist.csv"
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_reuses_compliance_report_summary(self):
+        summary = {
+            "total_controls": 3,
+            "implemented": 1,
+            "missing": 2,
+            "not_applicable": 0,
+            "layer_statistics": {"1": {"implemented": 1, "missing": 2, "not_applicable": 0}},
+        }
+        with open(security_dashboard.COMPLIANCE_REPORT_FILE, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "assessments": []}, f)
+        with mock.patch.object(security_dashboard, "assess_all") as assess_all:
+            metrics = self.dashboard.calculate_compliance_metrics()
+        assess_all.assert_not_called()
+        self.assertEqual(metrics["implemented_controls"], 1)
+        self.assertEqual(metrics["layer_metrics"]["1"], {"total": 3, "implemented": 1, "missing": 2})
+
+    def test_assesses_checklist_without_report(self):
+        summary = {"total_controls": 0, "implemented": 0, "missing": 0, "layer_statistics": {}}
+        with mock.patch.object(security_dashboard, "assess_all", return_value=([], summary)) as assess_all:
+            self.dashboard.calculate_compliance_metrics()
+        assess_all.assert_called_once_with("security_layers_checklist.csv")
+
+
+class CvssBaseScoreTest(unittest.TestCase):
+    def test_base_scores(self):
+        cases = {
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H": 9.8,
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:C/C:H/I:H/A:H": 10.0,
+            "CVSS:3.1/AV:N/AC:H/PR:N/UI:N/S:U/C:H/I:N/A:N": 5.9,
+            "CVSS:3.1/AV:N/AC:L/PR:N/UI:R/S:C/C:L/I:L/A:N": 6.1,
+            "CVSS:3.0/AV:L/AC:L/PR:L/UI:N/S:U/C:N/I:N/A:N": 0.0,
+        }
+        for vector, score in cases.items():
+            with self.subTest(vector=vector):
+                self.assertEqual(security_dashboard.cvss_base_score(vector), score)
+
+    def test_rejects_other_versions(self):
+        for vector in ("CVSS:2.0/AV:N/AC:L/Au:N/C:C/I:C/A:C", "CVSS:3.1/AV:N"):
+            with self.subTest(vector=vector):
+                with self.assertRaises(ValueError):
+                    security_dashboard.cvss_base_score(vector)
+
+
+if __name__ == "__main__":
+    unittest.main()